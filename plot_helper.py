@@ -4,22 +4,55 @@
 # * This module relies on matplotlib
 
 
-from typing import Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Sequence, Tuple, Union
+import math
+import multiprocessing
+import os
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib import cbook
+import matplotlib.lines as mlines
+from matplotlib.collections import LineCollection
+
+# * Line2D keyword arguments that can be forwarded to a LineCollection, mapped
+# * to the names understood by the collection.
+_COLLECTION_SPEC_KEYS = {
+    "c": "color", "color": "color",
+    "ls": "linestyle", "linestyle": "linestyle",
+    "lw": "linewidth", "linewidth": "linewidth",
+    "alpha": "alpha", "zorder": "zorder",
+}
+# * Curves with more points than this are drawn as Line2D even if they could
+# * be batched: Agg simplifies Line2D paths but not LineCollection paths, so
+# * batching only pays off for many short curves.
+_COLLECTION_MAX_POINTS = 2000
+# * Line types taking an (x, y) pair of 1D data, whose data is converted to
+# * arrays before plotting. Data of other types (e.g. "hist", "boxplot") is
+# * passed to matplotlib as it is.
+_XY_TYPES = {"curve", "plot", "scatter", "semilogx", "semilogy", "loglog", 
+             "step"}
 
 def single_plotter(plot_settings_list: Union[list, np.ndarray],
                 figsizewidth: float = 4.0,
                 figsizeheight: float = 2.0, 
                 right_yaxis_interval: float = 0.2, 
                 dpi: int = 300,
-                layout: str = "constrained",
+                layout: Union[str, None] = None,
+                dtype: Union[type, None] = None,
+                fig: Union[plt.Figure, None] = None,
+                grid_strategy: Union[str, Callable[[int], Tuple[int, int]],
+                                    None] = None,
+                downsample_to: Union[int, None] = None,
+                rasterize_above: Union[int, None] = None,
                 **kwargs,
             ) -> Tuple[plt.Figure, np.ndarray]:
     """ Generate a single figure and return the figure and a list containing
-        the main axes of it. This function will call 
-        `matplotlib.pyplot.figure` and `figure.add_subplot` functions to 
-        create subplots. 
+        the main axes of it. This function will create the figure and a
+        GridSpec for all subplots, and only add axes for the subplots that
+        are not blank. 
 
         NOTE: if you wants to create plots containing non-Roman characters
         (e.g. Chinese, Japanese, and Korean), you need to set the matplotlib
@@ -36,7 +69,7 @@ def single_plotter(plot_settings_list: Union[list, np.ndarray],
         Note that if you want to leave some subplots blank (e.g., you have a 
         3x3 subplot arrangement but you want to leave the subplot on the 
         position axes[2, 2] blank), then use an empty dict {} or None to
-        occupy that position.
+        occupy that position. No axes will be created for that position.
 
         `figsizewidth`: width of the figure. Default is 4. Note that when
         there is only one column of subplots for the figure, the figsizeheight 
@@ -53,10 +86,60 @@ def single_plotter(plot_settings_list: Union[list, np.ndarray],
         default it is set as 300 to make clear figures.
 
         `layout`: Same as the matplotlib.pyplot.plot keyword `layout`. By
-        default it is set as "constrained" to make elegant figures. 
+        default (None) "constrained" is used to make elegant figures, except
+        for figures with a single subplot with a single y axis and without
+        title, xlabel, or ylabel, where the default matplotlib margins are
+        enough and the layout engine is skipped to save time. Pass
+        "constrained" explicitly to use it for such figures as well, or
+        "none" to disable it for all figures.
+
+        `dtype`: floating point type (e.g. `np.float32`) that float x/y data
+        is cast to before plotting. Casting long float64 series to float32
+        halves the memory moved through the drawing pipeline, and at screen
+        resolution the result is visually identical; but float32 only keeps
+        about 7 significant digits, so do not use it for data like large
+        timestamps with small increments. Integer and non-numeric data,
+        lines with a `picker` spec, and the data of types not taking an
+        (x, y) pair (e.g. "hist", "boxplot") are never cast. By default it
+        is None (data is plotted as given).
+
+        `fig`: an existing figure to draw on. If given, it is cleared and
+        resized instead of creating a new figure, which saves the cost of
+        building a new figure when the same plots are regenerated in a loop
+        (e.g. saving many figures to disk). Other figure keyword arguments
+        are applied with `Figure.set`, so keywords that only make sense when
+        creating a figure (`num`, `clear`, `FigureClass`, `subplotpars`)
+        cannot be used together with `fig`. By default it is None (a new
+        figure is created).
+
+        `grid_strategy`: how to arrange a 1D `plot_settings_list` into rows
+        and columns instead of a single column. Use "square" to get a
+        roughly square grid (ceil(sqrt(N)) columns and as many rows as
+        needed), or a function taking the number of subplots N and returning
+        (nrows, ncols). Unused positions at the end are left blank, and the
+        figsizewidth/figsizeheight are not doubled. Ignored for 2D
+        `plot_settings_list`. By default it is None (a single column).
+
+        `downsample_to`: maximum number of points drawn for each line. Longer
+        1D "curve" lines are downsampled with the Largest-Triangle-Three-
+        Buckets algorithm, which keeps the visual shape of the curve, and
+        longer "scatter" lines are randomly subsampled (unless their spec
+        contains per-point arrays such as colors or sizes). Use something
+        like the width of the figure in pixels to speed up plotting long
+        series without visible difference. Gaps (NaN or masked points) in
+        curves are kept, which may add a few points. Must be at least 3
+        (LTTB always keeps the first and last points). By default it is None
+        (all points are drawn).
 
-        You may use other keyword arguments supported by `matplotlib.pyplot.plot`
-        function, but do NOTE that `figsize` should not be passed
+        `rasterize_above`: (x, y) lines with more points than this (after
+        `downsample_to`) are rasterized when the figure is saved in a vector
+        format (PDF, SVG, ...), while axes, labels, and text stay vector.
+        This keeps such files small and fast to display for long series.
+        The resolution of the rasterized lines is the `dpi` of `savefig`.
+        By default it is None (nothing is rasterized).
+
+        You may use other keyword arguments supported by
+        `matplotlib.pyplot.subplots` function, but do NOTE that `figsize` should not be passed
         as the figsize of the whole figure will be determined by the size
         of `plot_settings_list`, `figsizeweight`, and `figsizeheight`.
 
@@ -65,146 +148,326 @@ def single_plotter(plot_settings_list: Union[list, np.ndarray],
 
         `axes`: a 2D np.ndarray containing all axes that defines the
         x-axis of each subplot (i.e. the main axes) will be returned so that
-        one can easily make modifications to the x-axis. This array is
-        essentially the one created by the `matplotlib.pyplot.subplots`
-        function. NOTE that different from `ax` returned by `subplots`, 
+        one can easily make modifications to the x-axis. This array has the
+        same shape as the one created by the `matplotlib.pyplot.subplots`
+        function, except that blank subplots are None (so skip None elements
+        when iterating over it). NOTE that different from `ax` returned by
+        `subplots`, 
         if there is only one subplot (i.e. ncol=nrow=1), axes will be a
         1D array containing 1 axis element, instead of merely an `Axes` object.
         This is for the convenience of iteration.
         Also note that the additional axes for each subplot will not be
         contained.
     """
-    plotsarr = np.array(plot_settings_list, dtype=object)
-    plotnum = plotsarr.size
-    assert plotnum > 0, "No information for plotting!"
-    assert len(plotsarr.shape) <= 2, "Too many dimensions for plot setting list!"
-
-    # * If plotsarr is 1D, transform it into a 2D array.
-    # * otherwise the shape of plotsarr is maintained
-    if len(plotsarr.shape) == 1: 
-        plotsarr = plotsarr.reshape(-1, 1)
-    # * Double the height and width if any of them is 1.
-    if plotsarr.shape[0] == 1: figsizeheight = 2 * figsizeheight
-    if plotsarr.shape[1] == 1: figsizewidth = 2 * figsizewidth
-
-    # * Create figure with constrained (similar to tight) layout
-    fig, axes = plt.subplots(
-        nrows=plotsarr.shape[0], ncols=plotsarr.shape[1],
-        figsize=(figsizewidth * plotsarr.shape[1], 
-                figsizeheight * plotsarr.shape[0]), 
-        dpi=dpi,
-        layout=layout,
-        **kwargs,
-    )
-
-    if plotsarr.shape[0] == 1 and plotsarr.shape[1] == 1:
-        axes = np.array([axes], dtype=object)
-
-    # * Plot on each subplot axis
-    for idx in range(plotnum):
-        # * By numpy official doc, iteration is done in row-major, 
-        # * C-style order
-        ax_main = axes.flat[idx]
-        single_subplot_dict = plotsarr.flat[idx]
+    assert downsample_to is None or downsample_to >= 3, \
+        "downsample_to should be at least 3!"
+    # * Infer the arrangement of subplots from the lengths of the (nested)
+    # * list instead of building an object array out of all the settings.
+    plotsarr = plot_settings_list
+    if isinstance(plotsarr, np.ndarray):
+        assert plotsarr.ndim <= 2, "Too many dimensions for plot setting list!"
+        is_2d = plotsarr.ndim == 2
+    else:
+        is_2d = (len(plotsarr) > 0 
+                and isinstance(plotsarr[0], (list, tuple, np.ndarray)))
+    # * If plotsarr is 1D, treat it as a 2D array with shape (-1, 1).
+    nrows = len(plotsarr)
+    if isinstance(plotsarr, np.ndarray) and is_2d: ncols = plotsarr.shape[1]
+    else: ncols = len(plotsarr[0]) if is_2d else 1
+    assert nrows * ncols > 0, "No information for plotting!"
+    if is_2d and not isinstance(plotsarr, np.ndarray):
+        assert all(len(row) == ncols for row in plotsarr), \
+            "All rows of plot setting list should have the same length!"
+        assert not isinstance(plotsarr[0][0], (list, tuple)), \
+            "Too many dimensions for plot setting list!"
+    if grid_strategy is not None and not is_2d:
+        # * Arrange the 1D list into a grid, padding the unused positions at
+        # * the end with None (blank subplots).
+        plotnum = nrows
+        if grid_strategy == "square":
+            ncols = math.ceil(math.sqrt(plotnum))
+            nrows = math.ceil(plotnum / ncols)
+        else:
+            assert callable(grid_strategy), "Unknown grid strategy!"
+            nrows, ncols = grid_strategy(plotnum)
+        assert nrows * ncols >= plotnum, "Too few subplots in the grid!"
+        cells = list(plotsarr) + [None] * (nrows * ncols - plotnum)
+        plotsarr = [cells[row_idx * ncols:(row_idx + 1) * ncols] 
+                    for row_idx in range(nrows)]
+        is_2d = True
+    else:
+        # * Double the height and width if any of them is 1.
+        if nrows == 1: figsizeheight = 2 * figsizeheight
+        if ncols == 1: figsizewidth = 2 * figsizewidth
+
+    # * Keyword arguments of `matplotlib.pyplot.subplots` that do not belong
+    # * to the figure itself.
+    sharex = kwargs.pop("sharex", False)
+    sharey = kwargs.pop("sharey", False)
+    subplot_kw = kwargs.pop("subplot_kw", None) or {}
+    gridspec_kw = dict(kwargs.pop("gridspec_kw", None) or {})
+    for key in ("width_ratios", "height_ratios"):
+        if key in kwargs: gridspec_kw[key] = kwargs.pop(key)
+    kwargs.pop("squeeze", None)
+
+    # * Create figure with constrained (similar to tight) layout, unless the
+    # * figure only has a single subplot with a single y axis and no labels,
+    # * which fits into the default margins.
+    if layout is None:
+        is_simple = False
+        if nrows * ncols == 1:
+            single_subplot_dict = plotsarr[0][0] if is_2d else plotsarr[0]
+            single_subplot_dict = single_subplot_dict or {}
+            yaxes = single_subplot_dict.get("yaxes", None) or []
+            is_simple = (len(yaxes) <= 1
+                and single_subplot_dict.get("title", None) is None
+                and single_subplot_dict.get("xlabel", None) is None
+                and all(yaxis_dict.get("ylabel", None) is None 
+                        for yaxis_dict in yaxes))
+        layout = "none" if is_simple else "constrained"
+    if fig is None:
+        fig = plt.figure(
+            figsize=(figsizewidth * ncols, figsizeheight * nrows), 
+            dpi=dpi,
+            layout=layout,
+            **kwargs,
+        )
+    else:
+        # * Reuse the given figure
+        creation_only_kwargs = sorted(
+            {"num", "clear", "FigureClass", "subplotpars"} & kwargs.keys())
+        assert not creation_only_kwargs, \
+            f"{', '.join(creation_only_kwargs)} cannot be used with `fig`!"
+        fig.clf()
+        fig.set_size_inches(figsizewidth * ncols, figsizeheight * nrows)
+        fig.set_dpi(dpi)
+        fig.set_layout_engine(layout)
+        if kwargs: fig.set(**kwargs)
+    gs = fig.add_gridspec(nrows, ncols, **gridspec_kw)
+    if sharex or sharey:
+        # * Shared axes need the whole grid; blank ones are removed below.
+        axes = gs.subplots(sharex=sharex, sharey=sharey, squeeze=False,
+                        subplot_kw=subplot_kw)
+    else:
+        # * Axes are only created for the subplots that are not blank.
+        axes = np.empty((nrows, ncols), dtype=object)
+
+    # * Plot on each subplot axis. Both the settings and the axes are
+    # * iterated in row-major, C-style order.
+    axes_flat = axes.reshape(-1)
+    if is_2d: subplot_dicts = (cell for row in plotsarr for cell in row)
+    else: subplot_dicts = iter(plotsarr)
+    for flat_idx, single_subplot_dict in enumerate(subplot_dicts):
+        ax_main = axes_flat[flat_idx]
+        if not single_subplot_dict:
+            # * if single_subplot_dict is None or {}, then just leave this
+            # * subplot blank.
+            if ax_main is not None:
+                ax_main.remove()
+                axes_flat[flat_idx] = None
+            continue
+        if ax_main is None:
+            ax_main = fig.add_subplot(gs[flat_idx], **subplot_kw)
+            axes_flat[flat_idx] = ax_main
         _subplot_helper(
                         ax_main=ax_main, 
                         single_subplot_dict=single_subplot_dict,
                         right_yaxis_interval=right_yaxis_interval,
+                        dtype=dtype,
+                        downsample_to=downsample_to,
+                        rasterize_above=rasterize_above,
                     )
+    axes = axes_flat.reshape(nrows, ncols)
+
+    # * Keep the documented output shape: a 1D array when there is only
+    # * one row or one column of subplots, otherwise a 2D array.
+    if 1 in axes.shape: axes = axes.ravel()
 
     # * return figure itself and axes list
     return fig, axes
 
 
+@contextmanager
+def close_figs_on_exit():
+    """ Context manager that closes the figures created inside the `with`
+        block when leaving it, e.g.
+
+            with close_figs_on_exit():
+                fig, axes = single_plotter(plot_settings_list)
+                fig.savefig("some_figure.png")
+
+        Figures that already existed before entering the block are kept.
+        This is handy for batch jobs saving figures to disk, which otherwise
+        accumulate open figures or need `plt.close("all")`.
+    """
+    existing_fignums = set(plt.get_fignums())
+    try:
+        yield
+    finally:
+        for fignum in plt.get_fignums():
+            if fignum not in existing_fignums: plt.close(fignum)
+
+
+def batch_save(settings_list: Sequence[Union[list, np.ndarray]],
+                paths: Sequence[str],
+                n_jobs: int = -1,
+                savefig_kwargs: Union[dict, None] = None,
+                **plotter_kwargs,
+            ) -> None:
+    """ Generate one figure per element of `settings_list` with
+        `single_plotter` and save it to the corresponding path in `paths`,
+        using several processes in parallel.
+
+        Inputs:
+        `settings_list`: sequence of `plot_settings_list` (see
+        `single_plotter`), one for each figure.
+
+        `paths`: sequence of file paths the figures are saved to. Must have
+        the same length as `settings_list`.
+
+        `n_jobs`: number of worker processes. Negative values count from
+        the number of CPUs (-1 means all CPUs, -2 all but one, ...). With 1,
+        the figures are generated one by one in the current process. By
+        default it is -1.
+
+        `savefig_kwargs`: keyword arguments passed to `Figure.savefig`.
+        Unless given otherwise, `bbox_inches="tight"` is used so that no
+        labels are clipped.
+
+        Other keyword arguments are passed to `single_plotter`.
+
+        NOTE that the workers are started with the "spawn" method and use
+        the non-interactive "Agg" backend, so the plot settings (including
+        the data) must be picklable and this module must be importable by
+        the workers. When used in a script, call this function under
+        `if __name__ == "__main__":`.
+    """
+    assert len(settings_list) == len(paths), \
+        "settings_list and paths should have the same length!"
+    if n_jobs < 0: n_jobs = max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    if n_jobs == 1:
+        for plot_settings_list, path in zip(settings_list, paths):
+            _batch_save_one(plot_settings_list, path, plotter_kwargs, 
+                            savefig_kwargs)
+        return
+    with ProcessPoolExecutor(
+                max_workers=n_jobs,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_batch_worker_init,
+            ) as executor:
+        futures = [executor.submit(_batch_save_one, plot_settings_list, path,
+                                   plotter_kwargs, savefig_kwargs)
+                   for plot_settings_list, path in zip(settings_list, paths)]
+        # * re-raise the errors of the workers, if any
+        for future in futures: future.result()
+
+
+def _batch_worker_init() -> None:
+    # * Figures are only saved to files, no GUI backend is needed.
+    matplotlib.use("Agg")
+
+
+def _batch_save_one(plot_settings_list: Union[list, np.ndarray], path: str,
+                    plotter_kwargs: dict, 
+                    savefig_kwargs: Union[dict, None] = None) -> None:
+    fig, _ = single_plotter(plot_settings_list, **plotter_kwargs)
+    fig.savefig(path, **{"bbox_inches": "tight", **(savefig_kwargs or {})})
+    plt.close(fig)
+
+
 def _subplot_helper(
                     ax_main: plt.Axes, 
-                    single_subplot_dict: Union[dict, None], 
+                    single_subplot_dict: dict, 
                     right_yaxis_interval: float = 0.2, 
+                    dtype: Union[type, None] = None,
+                    downsample_to: Union[int, None] = None,
+                    rasterize_above: Union[int, None] = None,
                 ) -> None:
-    if not single_subplot_dict:
-        # * if single_subplot_dict is None or {}, then just hide this
-        # * subplot. 
-        ax_main.axis("off")
+    yaxes = single_subplot_dict.get("yaxes", None)
+    left_yaxisplot_dict = yaxes[0]
+    if len(yaxes) == 1:
+        _axes_plot_helper(ax_main, left_yaxisplot_dict, dtype=dtype,
+                        downsample_to=downsample_to,
+                        rasterize_above=rasterize_above)
     else:
-        yaxes = single_subplot_dict.get("yaxes", None)
-        left_yaxisplot_dict = yaxes[0]
-        if len(yaxes) == 1:
-            _axes_plot_helper(ax_main, left_yaxisplot_dict)
-        else:
-            # * When multiple axes exist for one subplot, the first axis will
-            # * be regarded as the major axis (left y axis), and the rests will
-            # * be the minor axis (right y axes). Will generate only one single
-            # * legend for each subplot, and only the legend setting for the 
-            # * major axis will work; the settings for minor axes will be 
-            # * ignored.
-            _axes_plot_helper(ax_main, left_yaxisplot_dict, plot_legend=False)
-            all_lines_list, all_labels_list = ax_main.get_legend_handles_labels()
-            right_y_pos = 1
-            for right_yaxisplot_dict in yaxes[1:]:
-                ax_right = ax_main.twinx()
-                ax_right.spines["right"].set_position(("axes", right_y_pos))
-                _axes_plot_helper(ax_right, right_yaxisplot_dict, plot_legend=False)
-                lines_right, labels_right = ax_right.get_legend_handles_labels()
-                all_lines_list = all_lines_list + lines_right
-                all_labels_list = all_labels_list + labels_right
-                right_y_pos += right_yaxis_interval
-            legend_settings = left_yaxisplot_dict.get("legend", None)
-            if legend_settings is not None:
-                # * NOTE that although the settings for the left y axis is used,
-                # * the legend is actually attached to the last right y axis, 
-                # * just to avoid overlapping of legend information
-                if legend_settings["visible"] == True:
-                    ax_right.legend(
-                        all_lines_list,
-                        all_labels_list,
-                        loc=legend_settings["loc"]
-                    )
-            else:
-                ax_right.legend(all_lines_list, all_labels_list)
-        xlim_settings = single_subplot_dict.get("xlim", None)
-        if xlim_settings is not None:
-            # * set lim as bottom and top format
-            if isinstance(xlim_settings, dict): ax_main.set_xlim(**xlim_settings)
-            # * set lim as array-like format
-            else: ax_main.set_xlim(xlim_settings)
-        xlabel_settings = single_subplot_dict.get("xlabel", None)
-        if xlabel_settings is not None: ax_main.set_xlabel(xlabel_settings)
-        title_settings = single_subplot_dict.get("title", None)
-        if title_settings is not None: ax_main.set_title(title_settings)
+        # * When multiple axes exist for one subplot, the first axis will
+        # * be regarded as the major axis (left y axis), and the rests will
+        # * be the minor axis (right y axes). Will generate only one single
+        # * legend for each subplot, and only the legend setting for the 
+        # * major axis will work; the settings for minor axes will be 
+        # * ignored.
+        _axes_plot_helper(ax_main, left_yaxisplot_dict, plot_legend=False,
+                        dtype=dtype, downsample_to=downsample_to,
+                        rasterize_above=rasterize_above)
+        # * Collect the handles and labels of each axis right after it is
+        # * plotted, and join them only once at the end.
+        handles_labels = [ax_main.get_legend_handles_labels()]
+        # * Positions of the spines of all right y axes
+        right_y_positions = 1 + right_yaxis_interval * np.arange(len(yaxes) - 1)
+        for right_yaxisplot_dict, right_y_pos in zip(yaxes[1:], 
+                                                     right_y_positions):
+            ax_right = ax_main.twinx()
+            ax_right.spines["right"].set_position(("axes", right_y_pos))
+            _axes_plot_helper(ax_right, right_yaxisplot_dict, plot_legend=False,
+                        dtype=dtype, downsample_to=downsample_to,
+                        rasterize_above=rasterize_above)
+            handles_labels.append(ax_right.get_legend_handles_labels())
+        all_lines_list = [h for hl in handles_labels for h in hl[0]]
+        all_labels_list = [l for hl in handles_labels for l in hl[1]]
+        legend_settings = left_yaxisplot_dict.get("legend", None)
+        if legend_settings is not None:
+            # * NOTE that although the settings for the left y axis is used,
+            # * the legend is actually attached to the last right y axis, 
+            # * just to avoid overlapping of legend information
+            if legend_settings["visible"] == True:
+                ax_right.legend(
+                    all_lines_list,
+                    all_labels_list,
+                    loc=legend_settings["loc"]
+                )
+        elif all_labels_list:
+            # * skip the legend if there is nothing labeled
+            ax_right.legend(all_lines_list, all_labels_list)
+    _set_helper(ax_main, single_subplot_dict, ("xlabel", "title"), "xlim")
 
 
 def _axes_plot_helper(some_ax: plt.Axes, some_ax_dict: dict, 
-            plot_legend: bool = True) -> None:
+            plot_legend: bool = True, 
+            dtype: Union[type, None] = None,
+            downsample_to: Union[int, None] = None,
+            rasterize_above: Union[int, None] = None) -> None:
     """ Plot helper for a single axis
-    """
 
-    for lineplot_dict in some_ax_dict["lines"]:
-        x_data = lineplot_dict.get("x", None)
-        specs = lineplot_dict.get("spec", None)
-        if lineplot_dict["type"] == "curve":
-            plot_func = some_ax.plot
-        else:
-            plot_func = getattr(some_ax, lineplot_dict["type"])
+        Besides "lines", "ylabel", "ylim", "grid", and "legend", the axis dict
+        may contain a "common_spec" dict of line properties shared by all
+        lines of the axis (e.g. {"linewidth": 0.8, "linestyle": "--"}). It is
+        merged into the "spec" of every line, which then only needs the
+        differences (e.g. "label" and "color") and overrides "common_spec".
+        The property cycle is left untouched, so lines without a color still
+        take the next color as usual. The keys must be valid for all line
+        types of the axis.
+    """
 
-        if x_data is None:
-            if specs is None:
-                plot_func(lineplot_dict["y"])
-            else:
-                plot_func(lineplot_dict["y"], **specs)
-        else:
-            if specs is None:
-                plot_func(x_data, lineplot_dict["y"])
-            else:
-                plot_func(x_data, lineplot_dict["y"], **specs)
-    ylabel_settings = some_ax_dict.get("ylabel", None)
-    if ylabel_settings is not None: some_ax.set_ylabel(ylabel_settings)
-
-    ylim_settings = some_ax_dict.get("ylim", None)
-    if ylim_settings is not None:
-        # * set lim as bottom and top format
-        if isinstance(ylim_settings, dict): some_ax.set_ylim(**ylim_settings)
-        # * set lim as array-like format
-        else: some_ax.set_ylim(ylim_settings)
+    # * Canonical names let "spec" override "common_spec" across aliases
+    # * (e.g. "c" over "color").
+    common_spec = cbook.normalize_kwargs(
+        some_ax_dict.get("common_spec", None) or {}, mlines.Line2D)
+    # * Resolve the common plot functions once for this axis; other types
+    # * are looked up by name on their first occurrence and then cached.
+    dispatch = {"curve": some_ax.plot, "scatter": some_ax.scatter}
+    for lines_group in _curve_runs(some_ax_dict["lines"], dtype,
+                                   downsample_to):
+        if len(lines_group) > 1 and not common_spec:
+            # * Consecutive curves sharing x and style are drawn as one
+            # * LineCollection instead of one Line2D artist per curve. This
+            # * is not done when there is a "common_spec", which is merged
+            # * into the spec of every line.
+            _curve_collection_helper(some_ax, lines_group, rasterize_above)
+            continue
+        for lineplot_dict, x_data, y_data in lines_group:
+            _line_plot_helper(some_ax, dispatch, lineplot_dict, x_data, y_data,
+                              rasterize_above, common_spec)
+    _set_helper(some_ax, some_ax_dict, ("ylabel",), "ylim")
     grid_settings = some_ax_dict.get("grid", None)
     if grid_settings is not None: some_ax.grid(**grid_settings)
     if plot_legend:
@@ -212,4 +475,242 @@ def _axes_plot_helper(some_ax: plt.Axes, some_ax_dict: dict,
         if legend_settings is not None:
             if legend_settings["visible"] == True:
                 some_ax.legend(loc=legend_settings["loc"])
-        else: some_ax.legend()
+        else:
+            # * skip the legend if there is nothing labeled
+            handles, labels = some_ax.get_legend_handles_labels()
+            if labels: some_ax.legend(handles, labels)
+
+
+def _line_plot_helper(some_ax: plt.Axes, dispatch: dict, lineplot_dict: dict,
+            x_data, y_data, rasterize_above: Union[int, None] = None,
+            common_line_spec: Union[dict, None] = None) -> None:
+    """ Plot a single line with the plot function of its type, looked up in
+        (and cached into) `dispatch`. `common_line_spec` is added to the spec
+        of the line, which takes priority.
+    """
+    line_type = lineplot_dict["type"]
+    plot_func = dispatch.get(line_type)
+    if plot_func is None:
+        plot_func = dispatch[line_type] = getattr(some_ax, line_type)
+    specs = lineplot_dict.get("spec", None)
+    if common_line_spec:
+        own_keys = cbook.normalize_kwargs(specs or {}, mlines.Line2D)
+        specs = {**{key: value for key, value in common_line_spec.items()
+                    if key not in own_keys}, **(specs or {})}
+    # * only count points of (x, y) types, whose data is an array here
+    if rasterize_above is not None and line_type in _XY_TYPES \
+            and np.ndim(y_data) > 0 and len(y_data) > rasterize_above:
+        specs = {**(specs or {}), "rasterized": True}
+    if x_data is None: args = (y_data,)
+    else: args = (x_data, y_data)
+    plot_func(*args, **(specs or {}))
+
+
+def _set_helper(some_ax: plt.Axes, settings_dict: dict, 
+                keys: Tuple[str, ...], lim_key: str) -> None:
+    """ Apply the settings under `keys` (e.g. "xlabel", "title") and the
+        `lim_key` ("xlim" or "ylim") setting of `settings_dict` with a single
+        `Axes.set` call.
+    """
+    set_kwargs = {key: settings_dict[key] for key in keys 
+                  if settings_dict.get(key, None) is not None}
+    lim_settings = settings_dict.get(lim_key, None)
+    # * set lim as array-like format
+    if lim_settings is not None and not isinstance(lim_settings, dict):
+        set_kwargs[lim_key] = lim_settings
+    if set_kwargs: some_ax.set(**set_kwargs)
+    # * set lim as bottom and top format
+    if isinstance(lim_settings, dict):
+        getattr(some_ax, f"set_{lim_key}")(**lim_settings)
+
+
+def _to_array(data, dtype: Union[type, None] = None):
+    """ Convert plot data to a contiguous np.ndarray once, so that matplotlib
+        does not have to re-convert it. Masked arrays are kept as they are.
+        Float data is cast to `dtype` if given.
+    """
+    if not isinstance(data, np.ma.MaskedArray):
+        data = np.ascontiguousarray(data)
+    if dtype is not None and np.issubdtype(data.dtype, np.floating):
+        data = data.astype(dtype, copy=False)
+    return data
+
+
+def _line_data(lineplot_dict: dict, dtype: Union[type, None] = None,
+            downsample_to: Union[int, None] = None) -> tuple:
+    """ Return the (x, y) arrays of a line. x is None if not given. The data
+        of types not in `_XY_TYPES` is returned unchanged.
+    """
+    if lineplot_dict["type"] not in _XY_TYPES:
+        return lineplot_dict.get("x", None), lineplot_dict["y"]
+    # * Keep full precision for pickable artists, whose data is read back
+    if "picker" in (lineplot_dict.get("spec", None) or {}): dtype = None
+    y_data = lineplot_dict["y"]
+    x_data = lineplot_dict.get("x", None)
+    if x_data is None:
+        # * matplotlib plots pandas data against its index when x is
+        # * omitted; keep that behavior after the conversion.
+        x_data = getattr(y_data, "index", None)
+        if callable(x_data): x_data = None    # * e.g. list.index
+    if x_data is not None: x_data = _to_array(x_data, dtype)
+    y_data = _to_array(y_data, dtype)
+    if downsample_to is not None and y_data.ndim == 1 \
+            and len(y_data) > downsample_to:
+        x_data, y_data = _downsample(lineplot_dict, x_data, y_data, 
+                                     downsample_to)
+    return x_data, y_data
+
+
+def _downsample(lineplot_dict: dict, x_data, y_data, 
+                downsample_to: int) -> tuple:
+    """ Downsample a long line to `downsample_to` points: LTTB for "curve"
+        and random subsampling for "scatter". Other types are not changed.
+    """
+    line_type = lineplot_dict["type"]
+    if line_type == "curve":
+        if not np.issubdtype(y_data.dtype, np.number): return x_data, y_data
+        if x_data is not None and np.issubdtype(x_data.dtype, np.number):
+            x_num = x_data
+        elif x_data is not None and np.issubdtype(x_data.dtype, np.datetime64):
+            x_num = x_data.astype("datetime64[ns]").astype(np.int64)
+        else:
+            # * without numeric x, treat the points as evenly spaced
+            x_num = np.arange(len(y_data))
+        # * masked points are treated like NaN (gaps) when choosing points;
+        # * the masks themselves are kept by indexing the original data
+        indices = _lttb_indices(
+            np.ma.filled(np.ma.asarray(x_num, dtype=np.float64), np.nan),
+            np.ma.filled(np.ma.asarray(y_data, dtype=np.float64), np.nan),
+            downsample_to)
+    elif line_type == "scatter":
+        specs = lineplot_dict.get("spec", None) or {}
+        if any(np.ndim(value) > 0 and len(value) == len(y_data) 
+                for value in specs.values()):
+            # * per-point specs would no longer match the points
+            return x_data, y_data
+        rng = np.random.default_rng(0)
+        indices = np.sort(rng.choice(len(y_data), downsample_to, replace=False))
+    else:
+        return x_data, y_data
+    # * x has to be given explicitly once points are dropped
+    if x_data is None: x_data = indices
+    else: x_data = x_data[indices]
+    return x_data, y_data[indices]
+
+
+def _lttb_indices(x_data: np.ndarray, y_data: np.ndarray, 
+                  downsample_to: int) -> np.ndarray:
+    """ Indices of the points kept by the Largest-Triangle-Three-Buckets
+        algorithm. The first and last points are always kept; the others are
+        split into `downsample_to - 2` buckets, and from each bucket the
+        point forming the largest triangle with the previously kept point
+        and the mean of the next bucket is kept.
+
+        Non-finite (NaN, inf) points never take part in the triangles. If a
+        bucket contains any of them, its first non-finite point is kept as
+        well so that the gap in the line stays visible; thus up to
+        `downsample_to - 2` extra points may be returned for gappy data.
+    """
+    length = len(y_data)
+    if downsample_to >= length: return np.arange(length)
+    valid = np.isfinite(x_data) & np.isfinite(y_data)
+    if not valid.any(): return np.array([0, length - 1], dtype=np.intp)
+    edges = np.linspace(1, length - 1, downsample_to - 1).astype(np.intp)
+    indices = [0]
+    # * the previously kept point is always a finite one
+    prev_idx = 0 if valid[0] else int(np.argmax(valid))
+    for bucket_idx in range(downsample_to - 2):
+        start, stop = edges[bucket_idx], edges[bucket_idx + 1]
+        next_stop = edges[bucket_idx + 2] if bucket_idx + 2 < len(edges) \
+                    else length
+        bucket_valid = valid[start:stop]
+        if not bucket_valid.all():
+            # * keep the gap
+            indices.append(start + int(np.argmin(bucket_valid)))
+            if not bucket_valid.any(): continue
+        next_valid = valid[stop:next_stop]
+        if not next_valid.any():
+            # * no finite point in the next bucket, use this bucket's mean
+            next_start, next_stop, next_valid = start, stop, bucket_valid
+        else: next_start = stop
+        next_x = x_data[next_start:next_stop][next_valid].mean()
+        next_y = y_data[next_start:next_stop][next_valid].mean()
+        prev_x, prev_y = x_data[prev_idx], y_data[prev_idx]
+        # * twice the triangle areas, the constant factor does not matter
+        areas = np.abs((prev_x - next_x) * (y_data[start:stop] - prev_y)
+                       - (prev_x - x_data[start:stop]) * (next_y - prev_y))
+        areas[~bucket_valid] = -1
+        prev_idx = start + int(np.argmax(areas))
+        indices.append(prev_idx)
+    indices.append(length - 1)
+    return np.unique(np.asarray(indices, dtype=np.intp))
+
+
+def _curve_batchable(lineplot_dict: dict, x_data, y_data) -> bool:
+    """ Whether a line can be merged into a LineCollection: a "curve" with
+        short, unmasked, numeric 1D x and y data and an explicit color,
+        without label or markers.
+    """
+    if lineplot_dict["type"] != "curve" or lineplot_dict.get("x") is None:
+        return False
+    specs = lineplot_dict.get("spec", None) or {}
+    if not all(key in _COLLECTION_SPEC_KEYS for key in specs): return False
+    if "c" not in specs and "color" not in specs: return False
+    # * column_stack would drop the masks of masked arrays
+    if isinstance(x_data, np.ma.MaskedArray) \
+            or isinstance(y_data, np.ma.MaskedArray): return False
+    return (x_data.ndim == 1 and x_data.shape == y_data.shape
+            and len(y_data) <= _COLLECTION_MAX_POINTS
+            and np.issubdtype(x_data.dtype, np.number)
+            and np.issubdtype(y_data.dtype, np.number))
+
+
+def _curve_runs(lines: list, dtype: Union[type, None] = None,
+            downsample_to: Union[int, None] = None):
+    """ Convert the data of each line in the "lines" list and split them into
+        groups of consecutive (lineplot_dict, x, y) tuples that can be drawn
+        together. A group contains more than one line only if all lines are
+        batchable curves sharing the same x object and spec.
+    """
+    run = []
+    for lineplot_dict in lines:
+        x_data, y_data = _line_data(lineplot_dict, dtype, downsample_to)
+        if not _curve_batchable(lineplot_dict, x_data, y_data):
+            if run: yield run
+            run = []
+            yield [(lineplot_dict, x_data, y_data)]
+            continue
+        if run:
+            first = run[0][0]
+            try:
+                same_style = (lineplot_dict["x"] is first["x"]
+                        and lineplot_dict.get("spec") == first.get("spec"))
+            except ValueError:
+                # * array-valued specs cannot be compared reliably
+                same_style = False
+            if not same_style:
+                yield run
+                run = []
+        run.append((lineplot_dict, x_data, y_data))
+    if run: yield run
+
+
+def _curve_collection_helper(some_ax: plt.Axes, lines_group: list,
+            rasterize_above: Union[int, None] = None) -> None:
+    """ Draw a group of batchable curves (see `_curve_runs`) as a single
+        LineCollection.
+    """
+    segments = [np.column_stack([x_data, y_data])
+                for _, x_data, y_data in lines_group]
+    specs = {"zorder": 2}    # * same default zorder as Line2D
+    for key, value in (lines_group[0][0].get("spec", None) or {}).items():
+        specs[_COLLECTION_SPEC_KEYS[key]] = value
+    # * Use the same cap and join styles as Line2D would
+    style = "solid" if specs.get("linestyle", "-") in ("-", "solid") else "dash"
+    specs["capstyle"] = plt.rcParams[f"lines.{style}_capstyle"]
+    specs["joinstyle"] = plt.rcParams[f"lines.{style}_joinstyle"]
+    if rasterize_above is not None \
+            and sum(len(segment) for segment in segments) > rasterize_above:
+        specs["rasterized"] = True
+    some_ax.add_collection(LineCollection(segments, **specs), autolim=True)
+    some_ax.autoscale_view()